@@ -1,4 +1,8 @@
 import datetime as dt
+import hashlib
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -32,6 +36,13 @@ TICKER_CATEGORIES = {
     "custom selection": [],
 }
 
+HISTORY_START = "2020-01-01"
+
+CACHE_DIR = Path(".cache")
+
+# about one quarter of trading days, so short time frames skip most row groups
+CACHE_ROW_GROUP_SIZE = 63
+
 PRESET_DESCRIPTIONS = {
     "core AI leaders": "mixture of big tech and flagship AI names (NVDA, MSFT, GOOGL, META, AMZN).",
     "AI hardware / semis": "chip designers / manufacturers most exposed to AI workloads.",
@@ -46,13 +57,86 @@ PRESET_DESCRIPTIONS = {
 # 2. data utilities
 # -------------------------------------------------------------------
 
+def price_cache_path(day: dt.date) -> Path:
+    """Map a download day to the parquet file caching the AI universe prices."""
+    universe = f"{','.join(AI_TICKERS)}|{HISTORY_START}"
+    key = hashlib.sha1(universe.encode()).hexdigest()
+    return CACHE_DIR / f"prices_{key[:12]}_{day.isoformat()}.parquet"
+
+
 @st.cache_data(show_spinner=True)
 def get_all_prices() -> pd.DataFrame:
     """
     Download full history once for all AI tickers.
-    Then only slice this DataFrame in memory to speed up everything.
+
+    Prices are float32, and today's download is also kept on disk as parquet,
+    so get_prices can read back only the slices it needs.
     """
-    return load_stock_data(AI_TICKERS, start="2020-01-01")
+    # the app keeps its own parquet cache, so skip the loader's Feather copy
+    prices = load_stock_data(AI_TICKERS, start=HISTORY_START, cache_dir=None)
+    cache_path = price_cache_path(dt.date.today())
+
+    # caching is best effort: a read-only disk must not break the app
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        prices.rename_axis("Date").reset_index().to_parquet(
+            cache_path,
+            index=False,
+            compression="zstd",
+            row_group_size=CACHE_ROW_GROUP_SIZE,
+        )
+        prefix = cache_path.name.rsplit("_", 1)[0]
+        for stale_path in CACHE_DIR.glob(f"{prefix}_*.parquet"):
+            if stale_path != cache_path:
+                stale_path.unlink(missing_ok=True)
+    except Exception:
+        pass
+
+    return prices
+
+
+def slice_prices(
+    prices_all: pd.DataFrame, start_date: dt.date, tickers: tuple[str, ...]
+) -> pd.DataFrame:
+    """Slice the in-memory price history to the selected dates and tickers."""
+    # resolve column positions in one lookup, then take columns positionally
+    col_idx = prices_all.columns.get_indexer(tickers)
+    if (col_idx < 0).any():
+        missing = [ticker for ticker, col in zip(tickers, col_idx) if col < 0]
+        raise KeyError(f"Tickers not found in downloaded prices: {missing}")
+
+    # the index is sorted, so the start date maps to a contiguous row slice
+    start_row = prices_all.index.searchsorted(pd.Timestamp(start_date), side="left")
+
+    return prices_all.iloc[start_row:, col_idx]
+
+
+@st.cache_data(show_spinner=True)
+def get_prices(start_date: dt.date, tickers: tuple[str, ...]) -> pd.DataFrame:
+    """
+    Load prices for the selected tickers from the start date onward.
+    Only the selected columns and the row groups after the start date
+    are read from today's parquet cache.
+    """
+    cache_path = price_cache_path(dt.date.today())
+
+    # download first if the cache is missing, slicing in memory if it stays so
+    if not cache_path.exists():
+        prices_all = get_all_prices()
+        if not cache_path.exists():
+            return slice_prices(prices_all, start_date, tickers)
+
+    # push the column projection and date filter down into the parquet reader
+    try:
+        prices = pd.read_parquet(
+            cache_path,
+            columns=["Date", *tickers],
+            filters=[("Date", ">=", pd.Timestamp(start_date))],
+        )
+    except Exception:
+        return slice_prices(get_all_prices(), start_date, tickers)
+
+    return prices.set_index("Date")
 
 
 def compute_start_date(label: str) -> dt.date:
@@ -71,6 +155,68 @@ def compute_start_date(label: str) -> dt.date:
     return today - dt.timedelta(days=5 * 365)
 
 
+def downsample_weekly(prices: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep the last trading day of each Monday-to-Sunday week.
+    One pass over the sorted index replaces the resample grouper.
+    """
+    # 1970-01-01 was a Thursday, so shifting by 3 days starts weeks on Monday
+    days = prices.index.to_numpy().astype("datetime64[D]").astype(np.int64)
+    weeks = (days + 3) // 7
+
+    # the last row of each week is where the week number changes
+    last_rows = np.append(np.flatnonzero(weeks[1:] != weeks[:-1]), len(weeks) - 1)
+
+    return prices.iloc[last_rows]
+
+
+@st.cache_data(show_spinner=False)
+def compute_cum_return(
+    start_date: dt.date, tickers: tuple[str, ...], downsample: bool
+) -> pd.DataFrame:
+    """
+    Compute cumulative returns (%) of the selected tickers since the start date.
+    Cached on its inputs, so reruns that don't change them reuse the result.
+    """
+    prices = get_prices(start_date, tickers)
+
+    if prices.empty:
+        return prices
+
+    if downsample:
+        prices = downsample_weekly(prices)
+
+    # normalize and compute cumulative returns in a single float32 buffer
+    values = prices.to_numpy()
+    cum_values = values / values[0]
+    cum_values -= 1.0
+    cum_values *= 100.0
+
+    return pd.DataFrame(cum_values, index=prices.index, columns=prices.columns)
+
+
+@st.cache_data(show_spinner=False)
+def render_summary_html(summary: pd.DataFrame) -> str:
+    """
+    Render the performance summary table to HTML.
+    Cached on the table contents, so unchanged tables skip the Styler render.
+    """
+    styler = (
+        summary.style.format({"total return (%)": "{:.1f}"})
+        .set_properties(subset=["total return (%)"], **{"text-align": "right"})
+        .set_table_styles(
+            [
+                {
+                    "selector": "th.col_heading",
+                    "props": [("text-align", "right")],
+                }
+            ]
+        )
+    )
+
+    return styler.to_html()
+
+
 # -------------------------------------------------------------------
 # 3. main app
 # -------------------------------------------------------------------
@@ -133,9 +279,11 @@ def main():
         st.session_state.current_preset = preset
         st.session_state.selected_tickers = preset_selection
 
+    # only reset the selection when the new preset actually changes it
     if preset != st.session_state.current_preset:
         st.session_state.current_preset = preset
-        st.session_state.selected_tickers = preset_selection
+        if frozenset(st.session_state.selected_tickers) != frozenset(preset_selection):
+            st.session_state.selected_tickers = preset_selection
 
     selected_tickers = st.sidebar.multiselect(
         "tickers (starting from preset)",
@@ -156,27 +304,19 @@ def main():
     )
 
     # ----- data loading & filtering -----
-    prices_all = get_all_prices()
-
     if not selected_tickers:
         st.warning("select at least one ticker to display.")
         st.stop()
 
-    prices = prices_all.loc[
-        prices_all.index >= pd.to_datetime(start_date), selected_tickers
-    ]
+    # sorted tickers give a stable cache key for the same selection
+    cum_return = compute_cum_return(
+        start_date, tuple(sorted(selected_tickers)), downsample
+    )
 
-    if prices.empty:
+    if cum_return.empty:
         st.warning("no data available for this combination of date range and tickers.")
         st.stop()
 
-    if downsample:
-        prices = prices.resample("W").last()
-
-    # normalize and compute cumulative returns
-    normalized = prices / prices.iloc[0]
-    cum_return = (normalized - 1.0) * 100.0
-
     # ----- main chart -----
     st.subheader("cumulative return since start date (%)")
     st.line_chart(cum_return)
@@ -190,20 +330,7 @@ def main():
 
     st.subheader("performance over selected period")
 
-    styler = (
-        summary.style.format({"total return (%)": "{:.1f}"})
-        .set_properties(subset=["total return (%)"], **{"text-align": "right"})
-        .set_table_styles(
-            [
-                {
-                    "selector": "th.col_heading",
-                    "props": [("text-align", "right")],
-                }
-            ]
-        )
-    )
-
-    st.dataframe(styler)
+    st.markdown(render_summary_html(summary), unsafe_allow_html=True)
 
     # ----- explanation -----
     with st.expander("how to read this chart"):
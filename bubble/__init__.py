@@ -2,6 +2,7 @@ from .loader import load_stock_data
 
 from .indicators import (
     build_equal_weight_index,
+    calculate_correlation_matrix,
     calculate_drawdown,
     calculate_index_returns,
     calculate_max_drawdown,
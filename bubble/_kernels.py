@@ -0,0 +1,183 @@
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def rolling_std_2d(values, window):
+    """
+    Calculate the rolling sample standard deviation of each column.
+
+    Parameters:
+        values (np.ndarray): 2D float64 array with time along the first axis.
+        window (int): rolling window size in number of rows.
+
+    Returns:
+        np.ndarray:
+            array of rolling standard deviations with the same shape as values.
+            Windows containing missing values are NaN, as in pandas.
+    """
+
+    n_obs, n_cols = values.shape
+    out = np.full((n_obs, n_cols), np.nan)
+
+    # slide a Welford accumulator down each column independently
+    for j in prange(n_cols):
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+
+        for i in range(n_obs):
+            # add the newest observation
+            value = values[i, j]
+            if not np.isnan(value):
+                count += 1
+                delta = value - mean
+                mean += delta / count
+                m2 += delta * (value - mean)
+
+            # remove the observation leaving the window
+            if i >= window:
+                value = values[i - window, j]
+                if not np.isnan(value):
+                    count -= 1
+                    if count == 0:
+                        mean = 0.0
+                        m2 = 0.0
+                    else:
+                        delta = value - mean
+                        mean -= delta / count
+                        m2 -= delta * (value - mean)
+
+            # emit only for windows without missing values
+            if i >= window - 1 and count == window and window > 1:
+                out[i, j] = np.sqrt(max(m2, 0.0) / (window - 1))
+
+    return out
+
+
+@njit(cache=True)
+def rolling_mean_std_1d(values, window):
+    """
+    Calculate the rolling mean and sample standard deviation in one pass.
+
+    Parameters:
+        values (np.ndarray): 1D float64 array ordered in time.
+        window (int): rolling window size in number of observations.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]:
+            arrays of rolling means and standard deviations with the same length
+            as values. Windows containing missing values are NaN, as in pandas.
+    """
+
+    n_obs = values.shape[0]
+    out_mean = np.full(n_obs, np.nan)
+    out_std = np.full(n_obs, np.nan)
+
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+
+    for i in range(n_obs):
+        # add the newest observation
+        value = values[i]
+        if not np.isnan(value):
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+
+        # remove the observation leaving the window
+        if i >= window:
+            value = values[i - window]
+            if not np.isnan(value):
+                count -= 1
+                if count == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = value - mean
+                    mean -= delta / count
+                    m2 -= delta * (value - mean)
+
+        # emit both statistics only for windows without missing values
+        if i >= window - 1 and count == window:
+            out_mean[i] = mean
+            if window > 1:
+                out_std[i] = np.sqrt(max(m2, 0.0) / (window - 1))
+
+    return out_mean, out_std
+
+
+@njit(cache=True)
+def rolling_mean_corr_2d(values, window):
+    """
+    Calculate the rolling average pairwise correlation across columns.
+
+    Parameters:
+        values (np.ndarray): 2D float64 array with time along the first axis.
+        window (int): rolling window size in number of rows.
+
+    Returns:
+        np.ndarray:
+            array of average correlations over distinct pairs of columns, one per
+            row. Pairs with missing values in the window are skipped, and rows
+            without any complete pair are NaN.
+    """
+
+    n_obs, n_cols = values.shape
+    out = np.full(n_obs, np.nan)
+
+    # running sums, observation counts and pairwise cross-products
+    sums = np.zeros(n_cols)
+    counts = np.zeros(n_cols, dtype=np.int64)
+    cross = np.zeros((n_cols, n_cols))
+
+    for i in range(n_obs):
+        # add the newest row and remove the row leaving the window
+        for j in range(n_cols):
+            value = values[i, j]
+            if not np.isnan(value):
+                sums[j] += value
+                counts[j] += 1
+                for k in range(j, n_cols):
+                    other = values[i, k]
+                    if not np.isnan(other):
+                        cross[j, k] += value * other
+
+            if i >= window:
+                value = values[i - window, j]
+                if not np.isnan(value):
+                    sums[j] -= value
+                    counts[j] -= 1
+                    for k in range(j, n_cols):
+                        other = values[i - window, k]
+                        if not np.isnan(other):
+                            cross[j, k] -= value * other
+
+        if i < window - 1:
+            continue
+
+        # average the correlation over distinct pairs of complete columns
+        total = 0.0
+        n_pairs = 0
+        for j in range(n_cols):
+            if counts[j] != window:
+                continue
+            mean_j = sums[j] / window
+            var_j = cross[j, j] / window - mean_j * mean_j
+            for k in range(j + 1, n_cols):
+                if counts[k] != window:
+                    continue
+                mean_k = sums[k] / window
+                var_k = cross[k, k] / window - mean_k * mean_k
+                cov = cross[j, k] / window - mean_j * mean_k
+                denom = np.sqrt(var_j * var_k)
+                if denom > 0.0:
+                    total += cov / denom
+                    n_pairs += 1
+
+        if n_pairs > 0:
+            out[i] = total / n_pairs
+
+    return out
@@ -1,8 +1,40 @@
 import numpy as np
 import pandas as pd
 
+# the compiled kernels in ._kernels are imported inside the functions that
+# use them, so importing bubble doesn't load numba
 
-def calculate_returns(close, log_returns=False):
+# largest number of stocks handled by the compiled rolling correlation kernel
+SMALL_UNIVERSE_SIZE = 16
+
+
+def _calculate_returns(prices, log_returns, dropna):
+    """
+    Calculate daily returns from prices in a single vectorized pass.
+
+    Parameters:
+        prices (pd.DataFrame or pd.Series): prices indexed by date.
+        log_returns (bool): If True, calculates log returns instead of simple returns.
+        dropna (bool): If True, drops rows with missing returns.
+
+    Returns:
+        pd.DataFrame or pd.Series: daily returns.
+    """
+
+    # calculate daily returns (logarithmic or simple)
+    if log_returns:
+        returns = np.log(prices).diff()
+    else:
+        returns = prices.pct_change()
+
+    # drop the leading missing row (and any other gaps) if requested
+    if dropna:
+        returns = returns.dropna()
+
+    return returns
+
+
+def calculate_returns(close, log_returns=False, dropna=True):
     """
     Calculate daily returns from closing prices.
 
@@ -11,6 +43,10 @@ def calculate_returns(close, log_returns=False):
         log_returns (bool, optional):
             If True, calculates log returns instead of simple returns.
             Else, defaults to False.
+        dropna (bool, optional):
+            If True, drops rows with missing returns, including the first row.
+            If False, keeps them as NaN, which the rolling indicators skip.
+            Defaults to True.
 
     Returns:
         pd.DataFrame: DataFrame of daily returns.
@@ -23,16 +59,10 @@ def calculate_returns(close, log_returns=False):
     if close.empty:
         raise ValueError(f"Input financial data is empty.")
 
-    # calculate daily returns (logarithmic or simple)
-    if log_returns:
-        returns = np.log(close / close.shift(1)).dropna()
-    else:
-        returns = close.pct_change().dropna()
-
-    return returns
+    return _calculate_returns(close, log_returns, dropna)
 
 
-def calculate_index_returns(index, log_returns=False):
+def calculate_index_returns(index, log_returns=False, dropna=True):
     """
     Calculate daily returns from closing prices (index level).
 
@@ -41,6 +71,10 @@ def calculate_index_returns(index, log_returns=False):
         log_returns (bool, optional):
             If True, calculates log returns instead of simple returns.
             Else, defaults to False.
+        dropna (bool, optional):
+            If True, drops rows with missing returns, including the first row.
+            If False, keeps them as NaN, which the rolling indicators skip.
+            Defaults to True.
 
     Returns:
         pd.Series: Series of index level returns.
@@ -53,37 +87,38 @@ def calculate_index_returns(index, log_returns=False):
     if index.empty:
         raise ValueError(f"Index level series is empty.")
 
-    # calculate daily returns (logarithmic or simple)
-    if log_returns:
-        returns = np.log(index / index.shift(1)).dropna()
-    else:
-        returns = index.pct_change().dropna()
-
-    return returns
+    return _calculate_returns(index, log_returns, dropna)
 
 
 def build_equal_weight_index(returns):
     """
-    Build an equal-weight index from a panel of returns.
+    Build an equal-weight index from a panel of prices.
 
     Parameters:
-        returns (pd.DataFrame): DataFrame of returns indexed by date.
+        returns (pd.DataFrame): DataFrame of prices (or other positive levels) indexed by date.
 
     Returns:
         pd.Series: equal-weight index level normalized to 1.0 at the start.
 
     Raises:
-        ValueError: If the input data is empty.
+        ValueError: If the input data is empty or the first row contains zeros.
     """
 
     # handle cases where no data exists
     if returns.empty:
         raise ValueError("Input financial data is empty.")
 
-    # normalize returns to 1.0 on the first date
-    normalized_returns = returns / returns.iloc[0]
-    index = normalized_returns.mean(axis=1)
-    index.name = "equal_weight_index"
+    # handle cases where a column cannot be normalized
+    values = returns.to_numpy(dtype=np.float64)
+    if (values[0] == 0).any():
+        raise ValueError("Cannot normalize data with zeros on the first date.")
+
+    # normalize each column to 1.0 on the first date and average across columns
+    index = pd.Series(
+        np.nanmean(values / values[0], axis=1),
+        index=returns.index,
+        name="equal_weight_index",
+    )
 
     return index
 
@@ -103,6 +138,8 @@ def calculate_rolling_volatility(returns, window=60):
         ValueError: If the input data is empty or has insufficient data points.
     """
 
+    from ._kernels import rolling_std_2d
+
     # handle cases where no data exists
     if returns.empty:
         raise ValueError(f"Input data on returns is empty.")
@@ -114,16 +151,140 @@ def calculate_rolling_volatility(returns, window=60):
             f"with window size {window}."
         )
 
-    # calculate rolling volatility for each stock
-    rolling_volatility = returns.rolling(window=window).std() * np.sqrt(252.0)
+    # calculate rolling volatility for each stock over column-contiguous data
+    values = np.asfortranarray(returns.to_numpy(dtype=np.float64))
+    rolling_volatility = pd.DataFrame(
+        rolling_std_2d(values, window) * np.sqrt(252.0),
+        index=returns.index,
+        columns=returns.columns,
+    )
 
     return rolling_volatility
 
 
+def calculate_correlation_matrix(returns):
+    """
+    Calculate the correlation matrix of returns with a few matrix products.
+
+    Parameters:
+        returns (pd.DataFrame): DataFrame of daily returns indexed by date.
+
+    Returns:
+        pd.DataFrame: correlation matrix with one row and column per stock.
+        Each pair uses the dates where both stocks have returns, as in
+        DataFrame.corr().
+
+    Raises:
+        ValueError: If the input data is empty.
+    """
+
+    # handle cases where no data exists
+    if returns.empty:
+        raise ValueError(f"Input data on returns is empty.")
+
+    # center each column for numerical stability and zero-fill missing values,
+    # keeping a mask of observed values
+    values = returns.to_numpy(dtype=np.float64)
+    mask = ~np.isnan(values)
+    values = values - np.nanmean(values, axis=0)
+    values[~mask] = 0.0
+    mask = mask.astype(np.float64)
+
+    # accumulate pairwise-complete counts and sums with BLAS calls, where
+    # entry [i, j] sums column i over the dates column j is observed too
+    n = mask.T @ mask
+    sx = values.T @ mask
+    sxx = (values * values).T @ mask
+    sxy = values.T @ values
+
+    # scale the pairwise covariance to correlation
+    cov = n * sxy - sx * sx.T
+    var = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.sqrt(var * var.T)
+
+    # pairs with fewer than two common dates have no correlation
+    corr[n < 2] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+
+    corr_matrix = pd.DataFrame(corr, index=returns.columns, columns=returns.columns)
+
+    return corr_matrix
+
+
+def _rolling_sum(values, window):
+    """
+    Calculate rolling sums along the first axis using cumulative sums.
+
+    Parameters:
+        values (np.ndarray): array of values with time along the first axis.
+        window (int): rolling window size in number of rows.
+
+    Returns:
+        np.ndarray: array of rolling sums, one per complete window.
+    """
+
+    # difference cumulative sums that are one window apart
+    cumulative = np.cumsum(values, axis=0)
+    rolling = cumulative[window - 1:].copy()
+    rolling[1:] -= cumulative[:-window]
+
+    return rolling
+
+
+def _rolling_mean_corr(values, window):
+    """
+    Calculate the rolling average pairwise correlation with NumPy rolling sums.
+
+    Parameters:
+        values (np.ndarray): 2D float64 array with time along the first axis.
+        window (int): rolling window size in number of rows.
+
+    Returns:
+        np.ndarray: array of average correlations over distinct pairs, one per row.
+    """
+
+    # mark missing values and zero them out of the sums
+    n_obs, n_stocks = values.shape
+    valid = np.isfinite(values)
+    values = np.where(valid, values, 0.0)
+
+    # calculate rolling sums, cross-products and observation counts
+    counts = _rolling_sum(valid.astype(np.float64), window)
+    sums = _rolling_sum(values, window)
+    cross = _rolling_sum(np.einsum("tn,tm->tnm", values, values), window)
+
+    # calculate rolling covariance and correlation for each pair of stocks
+    means = sums / window
+    cov = cross / window - means[:, :, None] * means[:, None, :]
+    std = np.sqrt(np.diagonal(cov, axis1=1, axis2=2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / (std[:, :, None] * std[:, None, :])
+
+    # keep distinct pairs only and drop windows with missing values
+    rows, cols = np.triu_indices(n_stocks, k=1)
+    pair_corr = corr[:, rows, cols]
+    complete = counts == window
+    pair_corr[~(complete[:, rows] & complete[:, cols])] = np.nan
+
+    # average over the pairs with a defined correlation
+    finite = np.isfinite(pair_corr)
+    mean_corr = np.full(n_obs, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_corr[window - 1:] = (
+            np.where(finite, pair_corr, 0.0).sum(axis=1) / finite.sum(axis=1)
+        )
+
+    return mean_corr
+
+
 def calculate_rolling_correlation(returns, window=60):
     """
     Calculate the average rolling correlation of returns over a specific window.
 
+    The average is taken over distinct pairs of stocks, so the diagonal of the
+    correlation matrix does not inflate the result.
+
     Parameters:
         returns (pd.DataFrame): DataFrame of daily returns indexed by date.
         window (int, optional): rolling window size in number of days. Defaults to 60 days.
@@ -136,6 +297,8 @@ def calculate_rolling_correlation(returns, window=60):
             If the input data is empty, has insufficient data points, or has less than two columns.
     """
 
+    from ._kernels import rolling_mean_corr_2d
+
     # handle cases where no data exists
     if returns.empty:
         raise ValueError(f"Input data on returns is empty.")
@@ -153,14 +316,19 @@ def calculate_rolling_correlation(returns, window=60):
             f"with window size {window}."
         )
 
-    # calculate rolling correlation for each pair of stocks
-    rolling_corr = returns.rolling(window=window).corr()
+    # convert returns to an array and center each column, so the running
+    # sums stay well conditioned (correlation is unaffected by the shift)
+    values = returns.to_numpy(dtype=np.float64)
+    values = values - np.nanmean(values, axis=0)
 
-    # group by dates and average correlations across all pairs
-    rolling_corr_mean = rolling_corr.groupby(level=0).mean()
+    # calculate mean correlation across pairs of stocks, using the compiled
+    # kernel for small universes where the pairwise sums fit in cache
+    if values.shape[1] <= SMALL_UNIVERSE_SIZE:
+        mean_corr = rolling_mean_corr_2d(values, window)
+    else:
+        mean_corr = _rolling_mean_corr(values, window)
 
-    # calculate mean correlation across pairs of stocks
-    mean_corr = rolling_corr_mean.mean(axis=1)
+    mean_corr = pd.Series(mean_corr, index=returns.index, name="mean_correlation")
 
     return mean_corr
 
@@ -170,17 +338,19 @@ def calculate_rolling_sharpe(returns, window=60, risk_free_rate=0.0):
     Calculate an approximate annualized rolling Sharpe ratio.
 
     Parameters:
-        returns (pd.Series): Series of daily returns of an index.
+        returns (pd.Series or pd.DataFrame): daily returns of an index, or one column per stock.
         window (int, optional): rolling window size in trading days. Defaults to 60 days.
         risk_free_rate (float, optional): annual risk-free rate as a decimal. Defaults to 0.0.
 
     Returns:
-        pd.Series: Series of rolling Sharpe ratios indexed by date.
+        pd.Series or pd.DataFrame: rolling Sharpe ratios indexed by date, shaped like returns.
 
     Raises:
         ValueError: If the input data is empty or has insufficient data points.
     """
 
+    from ._kernels import rolling_mean_std_1d
+
     # handle cases where no data exists
     if returns.empty:
         raise ValueError(f"Input data on returns is empty.")
@@ -196,25 +366,36 @@ def calculate_rolling_sharpe(returns, window=60, risk_free_rate=0.0):
     daily_risk_free_rate = risk_free_rate / 252.0
     excess_returns = returns - daily_risk_free_rate
 
-    # calculate rolling mean and std dev of excess returns
-    rolling_mean = excess_returns.rolling(window=window).mean()
-    rolling_std = excess_returns.rolling(window=window).std()
+    # calculate rolling mean and std dev of excess returns in a single pass,
+    # one column at a time for DataFrame input
+    values = excess_returns.to_numpy(dtype=np.float64).reshape(len(returns), -1)
+    sharpe_values = np.empty_like(values)
+    for j in range(values.shape[1]):
+        rolling_mean, rolling_std = rolling_mean_std_1d(
+            np.ascontiguousarray(values[:, j]), window
+        )
+
+        # calculate rolling Sharpe ratio
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe_values[:, j] = rolling_mean / rolling_std * np.sqrt(252.0)
 
-    # calculate rolling Sharpe ratio
-    sharpe = (rolling_mean / rolling_std) * np.sqrt(252.0)
+    if isinstance(returns, pd.DataFrame):
+        sharpe = pd.DataFrame(sharpe_values, index=returns.index, columns=returns.columns)
+    else:
+        sharpe = pd.Series(sharpe_values[:, 0], index=returns.index, name=returns.name)
 
     return sharpe
 
 
-def calculate_drawdown(index):
+def _drawdown_values(index):
     """
-    Compute the drawdown series for an index level.
+    Compute drawdown values for an index level as a NumPy array.
 
     Parameters:
         index (pd.Series): Series of index level indexed by date.
 
     Returns:
-        pd.Series: Series of drawdown values, which are negative or zero.
+        np.ndarray: array of drawdown values, which are negative or zero.
 
     Raises:
         ValueError: If the input data is empty.
@@ -224,12 +405,33 @@ def calculate_drawdown(index):
     if index.empty:
         raise ValueError("Index level series is empty.")
 
-    # calculate running maximum
-    running_max = index.cummax()
+    # calculate running maximum, skipping missing values like cummax
+    values = index.to_numpy(dtype=np.float64)
+    running_max = np.fmax.accumulate(values)
+
+    # calculate drawdown in place on the running maximum buffer
+    drawdown = np.divide(values, running_max, out=running_max)
+    drawdown -= 1.0
+
+    return drawdown
+
+
+def calculate_drawdown(index):
+    """
+    Compute the drawdown series for an index level.
+
+    Parameters:
+        index (pd.Series): Series of index level indexed by date.
+
+    Returns:
+        pd.Series: Series of drawdown values, which are negative or zero.
+
+    Raises:
+        ValueError: If the input data is empty.
+    """
 
     # calculate drawdown and name the series
-    drawdown = index / running_max - 1.0
-    drawdown.name = "drawdown"
+    drawdown = pd.Series(_drawdown_values(index), index=index.index, name="drawdown")
 
     return drawdown
 
@@ -245,7 +447,7 @@ def calculate_max_drawdown(index):
         float: maximum drawdown value (the most negative drawdown).
     """
 
-    # compute drawdown series
-    drawdown = calculate_drawdown(index)
+    # compute drawdown values without building a series
+    drawdown = _drawdown_values(index)
 
-    return drawdown.min()
+    return float(np.nanmin(drawdown))
@@ -1,17 +1,36 @@
+import hashlib
+import logging
+import re
+import numpy as np
 import pandas as pd
+import pyarrow.feather as feather
 import yfinance as yf
 from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# default directory for cached downloads
+CACHE_DIR = Path(".cache")
+
+# maximum number of tickers requested from Yahoo Finance in one download call
+BATCH_SIZE = 20
+
+# separators allowed between tickers given as a single string
+_TICKER_SEPARATOR = re.compile(r"[,\s]+")
 
 
 def _normalize_tickers(tickers):
-    # ensure tickers is a list of tickers as strings
+    # split a string into tickers, which are strings by construction
     if isinstance(tickers, str):
-        tickers = [
-            tick.strip() for tick in tickers.replace(",", " ").split() if tick.strip()
-        ]
+        tickers = [tick for tick in _TICKER_SEPARATOR.split(tickers.strip()) if tick]
 
-    # ensure tickers is a list
-    if not isinstance(tickers, list):
+    # ensure a list contains only strings
+    elif isinstance(tickers, list):
+        if not all(isinstance(ticker, str) for ticker in tickers):
+            raise ValueError("All tickers must be strings.")
+
+    else:
         raise TypeError(
             "Tickers must be provided as a list or a string separated by commas or spaces."
         )
@@ -20,14 +39,106 @@ def _normalize_tickers(tickers):
     if not tickers:
         raise ValueError("At least one ticker must be provided.")
 
-    # ensure all tickers are strings
-    if not all(isinstance(ticker, str) for ticker in tickers):
-        raise ValueError("All tickers must be strings.")
+    # drop repeated tickers, keeping first occurrences, since batched downloads
+    # only deduplicate within each batch
+    tickers = list(dict.fromkeys(tickers))
+
+    return tickers
+
+
+def _cache_paths(cache_dir, symbols, start, end, adjusted, fields):
+    # key cached files by the ticker set, date range and price adjustment
+    request = f"{','.join(sorted(set(symbols)))}|{start}|{end}|{adjusted}"
+    key = hashlib.sha1(request.encode()).hexdigest()
+
+    return {
+        field: Path(cache_dir) / f"{key}_{field.lower()}.feather" for field in fields
+    }
+
+
+def _read_cache(paths):
+    # treat missing or unreadable files as a cache miss
+    if not all(path.exists() for path in paths.values()):
+        return None
+
+    try:
+        frames = {}
+        for field, path in paths.items():
+            table = feather.read_table(path, memory_map=True)
+            frames[field] = table.to_pandas().set_index("Date")
+    except Exception:
+        return None
+
+    return frames
+
+
+def _write_cache(frames, paths):
+    # caching is best effort: a read-only disk must not break loading
+    try:
+        for field, path in paths.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            feather.write_feather(
+                frames[field].rename_axis("Date").reset_index(),
+                path,
+                compression="zstd",
+            )
+    except Exception:
+        pass
+
+
+def _download(symbols, start, end, adjusted, fields):
+    # split long ticker lists into batches of at most BATCH_SIZE symbols
+    batches = [
+        symbols[i : i + BATCH_SIZE] for i in range(0, len(symbols), BATCH_SIZE)
+    ]
+
+    # download each batch with one request thread per ticker and no progress bar,
+    # keeping fields on the outer column level so data[field] is a plain slice;
+    # batches run one after another because yf.download keeps its results in
+    # module-level state that concurrent calls would overwrite
+    try:
+        parts = [
+            yf.download(
+                batch,
+                start=start,
+                end=end,
+                progress=False,
+                auto_adjust=adjusted,
+                threads=True,
+                group_by="column",
+            )
+            for batch in batches
+        ]
+    except Exception as e:
+        raise RuntimeError(f"Failed to download data from Yahoo Finance: {e}")
+
+    # combine batches, keeping columns in sorted order
+    if len(parts) == 1:
+        data = parts[0]
+    else:
+        data = pd.concat(parts, axis=1).sort_index(axis=1)
+
+    # handle cases where no data exists
+    if data.empty:
+        raise ValueError(f"No data fetched for given tickers: {symbols}")
+
+    # handle cases where requested columns are missing
+    for field in fields:
+        if field not in data.columns.get_level_values(0):
+            raise KeyError(f"'{field}' column not found in downloaded data.")
+
+    # extract closing prices in single precision, plenty for price charts
+    close = data["Close"].astype(np.float32, copy=False)
+
+    # drop empty columns with a column mask rather than an in-place dropna
+    frames = {"Close": close.loc[:, close.notna().any()]}
 
-    # sort tickers for consistent order
-    sorted_tickers = sorted(tickers)
+    # extract volume and drop empty columns (yfinance returns a fresh frame)
+    if "Volume" in fields:
+        volume = data["Volume"]
+        frames["Volume"] = volume.loc[:, volume.notna().any()]
 
-    return sorted_tickers
+    return frames
 
 
 def load_stock_data(
@@ -35,7 +146,10 @@ def load_stock_data(
     start="2020-01-01", 
     end=None, 
     adjusted=True, 
-    include_volume=False
+    include_volume=False,
+    dtype_backend=None,
+    cache_dir=CACHE_DIR,
+    force_refresh=False,
 ):
     """
     Load historical stock data for given tickers using Yahoo Finance.
@@ -53,53 +167,66 @@ def load_stock_data(
         include_volume (bool, optional):
             If True, also include volume data.
             If False, don't include volume data.
+        dtype_backend (str, optional):
+            If "pyarrow", return pyarrow-backed columns (Arrow memory layout).
+            If None, return NumPy-backed columns. Defaults to None.
+        cache_dir (str or Path, optional):
+            directory for Feather copies of downloads, keyed by tickers, dates and
+            adjustment. If None, always download. Defaults to ".cache".
+        force_refresh (bool, optional):
+            If True, download again and overwrite any cached copy.
+            Else, defaults to False.
 
     Returns:
         pd.DataFrame:
         - if include_volume is True: pandas DataFrame of closing prices and volume indexed by date.
         - if include_volume is False: pandas DataFrame of closing prices indexed by date.
+        Closing prices are returned as float32.
     """
-    # normalize and sort tickers
+    # handle unsupported dtype backends
+    if dtype_backend not in (None, "pyarrow"):
+        raise ValueError(
+            f"Unsupported dtype backend: {dtype_backend}. Use None or 'pyarrow'."
+        )
+
+    # normalize tickers (yfinance returns columns in sorted order)
     symbols = _normalize_tickers(tickers)
 
     # set end date to today if no end date is provided
     if end is None:
         end = datetime.today().strftime("%Y-%m-%d")
 
-    # download data and suppress progress bar
-    try:
-        data = yf.download(
-            symbols, start=start, end=end, progress=False, auto_adjust=adjusted
-        )
-    except Exception as e:
-        raise RuntimeError(f"Failed to download data from Yahoo Finance: {e}")
+    # read cached data, downloading and caching it on a miss
+    fields = ["Close", "Volume"] if include_volume else ["Close"]
+    frames = None
 
-    # handle cases where no data exists
-    if data.empty:
-        raise ValueError(f"No data fetched for given tickers: {symbols}")
+    if cache_dir is not None:
+        paths = _cache_paths(cache_dir, symbols, start, end, adjusted, fields)
+        if not force_refresh:
+            frames = _read_cache(paths)
+            if frames is not None:
+                logger.debug("read cached data for %s from %s to %s", symbols, start, end)
 
-    # handle cases where 'Close' column is missing
-    if "Close" not in data.columns.get_level_values(0):
-        raise KeyError("'Close' column not found in downloaded data.")
+    if frames is None:
+        logger.info("downloading data for %s from %s to %s", symbols, start, end)
+        frames = _download(symbols, start, end, adjusted, fields)
+        if cache_dir is not None:
+            _write_cache(frames, paths)
 
-    # extract closing prices
-    close = data["Close"].copy()
+    close = frames["Close"]
 
-    # drop empty columns
-    close.dropna(axis=1, how="all", inplace=True)
+    # convert to pyarrow-backed columns if requested
+    if dtype_backend == "pyarrow":
+        close = close.astype("float32[pyarrow]")
 
     # return close data only
     if not include_volume:
         return close
 
-    # handle cases where 'Close' column is missing
-    if "Volume" not in data.columns.get_level_values(0):
-        raise KeyError("'Volume' column not found in downloaded data.")
-
-    # extract closing prices
-    volume = data["Volume"].copy()
+    volume = frames["Volume"]
 
-    # drop empty columns
-    volume.dropna(axis=1, how="all", inplace=True)
+    # convert to pyarrow-backed columns if requested
+    if dtype_backend == "pyarrow":
+        volume = volume.convert_dtypes(dtype_backend="pyarrow")
 
     return close, volume
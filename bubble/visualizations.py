@@ -1,5 +1,148 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
+import pandas as pd
+
+from .indicators import calculate_correlation_matrix
+
+# whether _pyplot has already applied the default Agg path chunk size
+_chunksize_checked = False
+
+
+def _pyplot():
+    """
+    Import pyplot on first use, so importing bubble doesn't load matplotlib.
+
+    Returns:
+        module: the matplotlib.pyplot module.
+    """
+
+    global _chunksize_checked
+
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    # let Agg render long paths in chunks instead of one huge path, checking
+    # only once and only while the setting is still at its default of 0, so
+    # a value the user chose is never overridden
+    if not _chunksize_checked:
+        _chunksize_checked = True
+        if matplotlib.rcParams["agg.path.chunksize"] == 0:
+            matplotlib.rcParams["agg.path.chunksize"] = 10000
+
+    return plt
+
+
+def _lttb(x, y, n_out=1500):
+    """
+    Pick rows of one or more lines with Largest-Triangle-Three-Buckets downsampling.
+
+    Parameters:
+        x (np.ndarray): 1D float array of increasing x positions.
+        y (np.ndarray):
+            1D or 2D float array of values with one row per x position and one
+            column per line. Missing values are allowed.
+        n_out (int, optional): number of rows to keep. Defaults to 1500.
+
+    Returns:
+        np.ndarray: sorted integer positions of the rows to keep.
+    """
+
+    n_obs = len(x)
+    if n_out >= n_obs or n_out < 3:
+        return np.arange(n_obs)
+
+    # scale each line to unit spread, so every line weighs equally in the shared
+    # choice of rows, and mark missing values with zero weight
+    y = y.reshape(n_obs, -1)
+    observed = ~np.isnan(y)
+    counts = np.maximum(observed.sum(axis=0), 1)
+    centered = np.where(observed, y - np.where(observed, y, 0.0).sum(axis=0) / counts, 0.0)
+    scale = np.sqrt((centered * centered).sum(axis=0) / counts)
+    y = y / np.where(scale > 0, scale, 1.0)
+    filled = np.where(observed, y, 0.0)
+
+    # split the interior rows into n_out - 2 buckets, keeping both end rows
+    edges = np.linspace(1, n_obs - 1, n_out - 1).astype(np.int64)
+
+    # average of each bucket, used as the third triangle vertex for the bucket before it
+    starts = edges[:-1] - 1
+    mean_x = np.add.reduceat(x[1:-1], starts) / np.diff(edges)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_y = (
+            np.add.reduceat(filled[1:-1], starts, axis=0)
+            / np.add.reduceat(observed[1:-1], starts, axis=0)
+        )
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.vstack([mean_y[1:], y[-1:]])
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n_obs - 1
+
+    # in each bucket keep the row spanning the largest total triangle area with
+    # the previously kept row and the next bucket's average, skipping lines
+    # with missing values at any of the three vertices
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        prev_x, prev_y = x[keep[b]], y[keep[b]]
+        area = np.abs(
+            (prev_x - next_x[b]) * (y[lo:hi] - prev_y)
+            - (prev_x - x[lo:hi, None]) * (next_y[b] - prev_y)
+        )
+        keep[b + 1] = lo + np.argmax(np.nansum(area, axis=1))
+
+    return keep
+
+
+def _thin(data, max_points=3000, target_points=1500):
+    """
+    Thin long time series to roughly what a figure can resolve.
+
+    Parameters:
+        data (pd.Series or pd.DataFrame): data indexed by date.
+        max_points (int, optional): length above which data is thinned. Defaults to 3000.
+        target_points (int, optional): number of rows to keep. Defaults to 1500.
+
+    Returns:
+        pd.Series or pd.DataFrame:
+            target_points rows of data chosen by LTTB downsampling, which keeps
+            peaks and troughs, or data itself if short. All columns of a
+            DataFrame share the same rows.
+    """
+
+    # keep short series untouched
+    if len(data) <= max_points:
+        return data
+
+    # use dates as x positions where available, otherwise row numbers
+    if isinstance(data.index, pd.DatetimeIndex):
+        x = data.index.asi8.astype(np.float64)
+    else:
+        x = np.arange(len(data), dtype=np.float64)
+
+    # pick one set of rows from buckets shared by all columns
+    rows = _lttb(x, data.to_numpy(dtype=np.float64), target_points)
+
+    return data.iloc[rows]
+
+
+def _show(fig):
+    """
+    Display a figure and release it from pyplot.
+
+    Parameters:
+        fig (matplotlib.figure.Figure): figure to display.
+
+    Returns:
+        None
+    """
+
+    plt = _pyplot()
+
+    # close the figure even if displaying it fails, so figures don't accumulate
+    try:
+        plt.show()
+    finally:
+        plt.close(fig)
 
 
 def plot_correlation_matrix(returns):
@@ -7,21 +150,43 @@ def plot_correlation_matrix(returns):
     Plot the correlation matrix of stock returns.
 
     Parameters:
-        returns (pd.DataFrame): DataFrame of daily returns indexed by date.
+        returns (pd.DataFrame):
+            DataFrame of daily returns indexed by date, or a precomputed
+            correlation matrix whose index matches its columns.
 
     Returns:
         None
     """
 
-    # plot correlation matrix of returns
-    corr_matrix = returns.corr()
+    plt = _pyplot()
+
+    # use a precomputed correlation matrix as is, otherwise calculate it
+    if returns.index.equals(returns.columns):
+        corr_matrix = returns
+    else:
+        corr_matrix = calculate_correlation_matrix(returns)
+
+    values = corr_matrix.to_numpy()
+    tickers = corr_matrix.columns
+
+    # create a heatmap as a single image with specified settings
+    fig, ax = plt.subplots(figsize=(10, 8))
+    image = ax.imshow(values, cmap="coolwarm", vmin=-1, vmax=1)
+    fig.colorbar(image, ax=ax)
+    ax.set_xticks(range(len(tickers)), tickers, rotation=90)
+    ax.set_yticks(range(len(tickers)), tickers)
+
+    # annotate cells only while the matrix is small enough to read,
+    # using white text on the dark ends of the color map
+    if len(tickers) <= 20:
+        labels = np.char.mod("%.2f", values)
+        for i, j in np.ndindex(values.shape):
+            color = "white" if abs(values[i, j]) > 0.6 else "black"
+            ax.text(j, i, labels[i, j], ha="center", va="center", color=color)
 
-    # create a heatmap with specified settings
-    plt.figure(figsize=(10, 8))
-    sns.heatmap(corr_matrix, annot=True, cmap="coolwarm", vmin=-1, vmax=1)
-    plt.title("correlation matrix of AI stock returns")
-    plt.tight_layout()
-    plt.show()
+    ax.set_title("correlation matrix of AI stock returns")
+    fig.tight_layout()
+    _show(fig)
 
 
 def plot_rolling_correlation(rolling_corr):
@@ -35,18 +200,25 @@ def plot_rolling_correlation(rolling_corr):
         None
     """
 
+    plt = _pyplot()
+
     # create a line plot with specified settings
-    plt.figure(figsize=(10, 6))
-    plt.plot(rolling_corr, color="purple", label="average 60 days rolling correlation")
-    plt.axhline(y=0.5, color="gray", linestyle="--")
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(
+        rolling_corr.index,
+        rolling_corr.to_numpy(dtype=float),
+        color="purple",
+        label="average 60 days rolling correlation",
+    )
+    ax.axhline(y=0.5, color="gray", linestyle="--")
 
-    plt.title("60-day rolling average correlation among AI stocks")
-    plt.ylabel("average correlation")
-    plt.xlabel("date")
+    ax.set_title("60-day rolling average correlation among AI stocks")
+    ax.set_ylabel("average correlation")
+    ax.set_xlabel("date")
 
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    ax.legend()
+    fig.tight_layout()
+    _show(fig)
 
 
 def plot_rolling_volatility(
@@ -71,6 +243,8 @@ def plot_rolling_volatility(
         KeyError: If any ticker in subset is not found in rolling_vol columns.
     """
 
+    plt = _pyplot()
+
     # filter data if subset is provided
     if subset is not None:
         missing = set(subset) - set(rolling_vol.columns)
@@ -78,30 +252,30 @@ def plot_rolling_volatility(
             raise KeyError(f"Tickers not found in rolling_vol: {missing}")
         rolling_vol = rolling_vol[subset]
 
-    plt.figure(figsize=(10, 6))
+    fig, ax = plt.subplots(figsize=(10, 6))
 
     # plot average or individual volatility based on average_only flag
     if average_only:
         avg_vol = rolling_vol.mean(axis=1)
-        plt.plot(avg_vol.index, avg_vol.values, label="average AI volatility")
+        ax.plot(avg_vol.index, avg_vol.values, label="average AI volatility")
     else:
         for column in rolling_vol.columns:
-            plt.plot(rolling_vol.index, rolling_vol[column], label=column, alpha=0.7)
+            ax.plot(rolling_vol.index, rolling_vol[column], label=column, alpha=0.7)
 
-    plt.axhline(y=0.2, color="gray", linestyle="--", linewidth=1)
+    ax.axhline(y=0.2, color="gray", linestyle="--", linewidth=1)
 
-    plt.title("60-day rolling annualized volatility of AI stocks")
-    plt.ylabel("annualized volatility")
-    plt.xlabel("date")
+    ax.set_title("60-day rolling annualized volatility of AI stocks")
+    ax.set_ylabel("annualized volatility")
+    ax.set_xlabel("date")
 
     # adjust legend based on number of lines plotted
     if average_only or (subset is not None and len(subset) <= 6):
-        plt.legend()
+        ax.legend()
     else:
-        plt.legend(loc="upper left", bbox_to_anchor=(1.02, 1.0), fontsize="small")
+        ax.legend(loc="upper left", bbox_to_anchor=(1.02, 1.0), fontsize="small")
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    _show(fig)
 
 
 def plot_rolling_sharpe(rolling_sharpe):
@@ -115,23 +289,29 @@ def plot_rolling_sharpe(rolling_sharpe):
         None
     """
 
+    plt = _pyplot()
+
+    # thin long series before drawing
+    rolling_sharpe = _thin(rolling_sharpe)
+
     # create a line plot with specified settings
-    plt.figure(figsize=(10, 6))
-    plt.plot(
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(
         rolling_sharpe.index,
-        rolling_sharpe.values,
+        rolling_sharpe.to_numpy(dtype=float),
         color="purple",
         label="average 60 days rolling Sharpe ratio",
+        rasterized=True,
     )
-    plt.axhline(y=0.0, color="gray", linestyle="--")
+    ax.axhline(y=0.0, color="gray", linestyle="--")
 
-    plt.title("60-day rolling average Sharpe ratio among AI stocks")
-    plt.ylabel("average Sharpe ratio")
-    plt.xlabel("date")
+    ax.set_title("60-day rolling average Sharpe ratio among AI stocks")
+    ax.set_ylabel("average Sharpe ratio")
+    ax.set_xlabel("date")
 
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    ax.legend()
+    fig.tight_layout()
+    _show(fig)
 
 
 def plot_drawdown(drawdown, label):
@@ -146,22 +326,28 @@ def plot_drawdown(drawdown, label):
         None
     """
 
+    plt = _pyplot()
+
+    # thin long series before drawing
+    drawdown = _thin(drawdown)
+
     # create a line plot with specified settings
-    plt.figure(figsize=(10, 6))
-    plt.fill_between(drawdown.index, drawdown.values, 0, alpha=0.25)
-    plt.plot(
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.fill_between(drawdown.index, drawdown.values, 0, alpha=0.25, rasterized=True)
+    ax.plot(
         drawdown.index,
         drawdown.values,
         label=label,
+        rasterized=True,
     )
 
-    plt.ylabel("drawdown")
-    plt.xlabel("date")
-    plt.title(f"drawdown for {label}")
+    ax.set_ylabel("drawdown")
+    ax.set_xlabel("date")
+    ax.set_title(f"drawdown for {label}")
 
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    ax.legend()
+    fig.tight_layout()
+    _show(fig)
 
 
 def plot_normalized_prices(prices):
@@ -175,29 +361,36 @@ def plot_normalized_prices(prices):
         None
     """
 
+    import seaborn as sns
+
+    plt = _pyplot()
+
     # normalize prices to start at 1
     normalized_prices = prices / prices.iloc[0]
 
     # generate distinct colors for each stock line
     colors = sns.color_palette("deep", n_colors=len(normalized_prices.columns))
 
-    # create a line plot with specified settings
-    plt.figure(figsize=(10, 6))
-    for idx, column in enumerate(normalized_prices.columns):
-        sns.lineplot(
-            x=normalized_prices.index,
-            y=normalized_prices[column],
-            label=column,
-            color=colors[idx],
-        )
+    # thin long series before drawing
+    normalized_prices = _thin(normalized_prices)
+
+    # draw all stock lines in a single call over the 2D array of prices
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.set_prop_cycle(color=colors)
+    ax.plot(
+        normalized_prices.index,
+        normalized_prices.to_numpy(dtype=float),
+        label=list(normalized_prices.columns),
+        rasterized=True,
+    )
 
-    plt.ylabel("normalized return (start @ 1.0)")
-    plt.xlabel("date")
-    plt.title("normalized return of selected AI-related stocks")
+    ax.set_ylabel("normalized return (start @ 1.0)")
+    ax.set_xlabel("date")
+    ax.set_title("normalized return of selected AI-related stocks")
 
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    ax.legend()
+    fig.tight_layout()
+    _show(fig)
 
 
 def plot_index_vs_benchmark(
@@ -219,23 +412,30 @@ def plot_index_vs_benchmark(
         None
     """
 
-    # find common dates between the two indices
-    common_index = ai_index.index.intersection(benchmark_index.index)
-    ai = ai_index.loc[common_index]
-    bench = benchmark_index.loc[common_index]
+    plt = _pyplot()
+
+    # align both indices on their common dates in a single join
+    aligned = pd.concat(
+        [ai_index.rename("ai"), benchmark_index.rename("bench")],
+        axis=1,
+        join="inner",
+    )
+
+    # thin long series before drawing
+    aligned = _thin(aligned)
 
     # create a line plot with specified settings
-    plt.figure(figsize=(10, 6))
-    plt.plot(ai.index, ai, label=ai_label)
-    plt.plot(bench.index, bench, label=benchmark_label)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(aligned.index, aligned["ai"].to_numpy(), label=ai_label, rasterized=True)
+    ax.plot(aligned.index, aligned["bench"].to_numpy(), label=benchmark_label, rasterized=True)
 
-    plt.ylabel("normalized index level")
-    plt.xlabel("date")
-    plt.title(f"{ai_label} vs {benchmark_label}")
+    ax.set_ylabel("normalized index level")
+    ax.set_xlabel("date")
+    ax.set_title(f"{ai_label} vs {benchmark_label}")
 
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    ax.legend()
+    fig.tight_layout()
+    _show(fig)
 
 
 def plot_return_distribution(
@@ -257,15 +457,27 @@ def plot_return_distribution(
         None
     """
 
-    # create a density plot with specified settings
-    plt.figure(figsize=(10, 6))
-    sns.kdeplot(ai_returns, label=ai_label)
-    sns.kdeplot(benchmark_returns, label=benchmark_label)
+    import seaborn as sns
+
+    plt = _pyplot()
+
+    # create a density plot with specified settings, evaluating each KDE on
+    # 100 grid points from plain arrays without missing values
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for returns, label in [(ai_returns, ai_label), (benchmark_returns, benchmark_label)]:
+        sns.kdeplot(
+            returns.dropna().to_numpy(dtype=float),
+            label=label,
+            ax=ax,
+            gridsize=100,
+            bw_adjust=1.0,
+            cut=3,
+        )
 
-    plt.ylabel("density")
-    plt.xlabel("daily return")
-    plt.title(f"return distribution comparison: {ai_label} vs {benchmark_label}")
+    ax.set_ylabel("density")
+    ax.set_xlabel("daily return")
+    ax.set_title(f"return distribution comparison: {ai_label} vs {benchmark_label}")
 
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
+    ax.legend()
+    fig.tight_layout()
+    _show(fig)